@@ -1,52 +1,103 @@
+import logging
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CANCEL_FRAME = orjson.dumps({"event_id": "testing123", "type": "response.cancel"}).decode()
+AUDIO_DELTA_TYPE_MARKER = '"type":"response.audio.delta"'
+AUDIO_DELTA_FIELD = '"delta":"'
+
+
+def extract_audio_delta(message):
+    """Return the base64 delta of a raw response.audio.delta frame, or None for any other frame."""
+    if AUDIO_DELTA_TYPE_MARKER not in message[:128]:
+        return None
+    start = message.find(AUDIO_DELTA_FIELD)
+    if start == -1:
+        return None
+    start += len(AUDIO_DELTA_FIELD)
+    # Base64 never contains a quote, so the next one closes the value
+    end = message.find('"', start)
+    if end == -1:
+        return None
+    return message[start:end]
+
+
 async def send_to_twilio():
             """Receive events from the OpenAI Realtime API, send audio back to Twilio."""
             nonlocal stream_sid
             is_streaming = True
+
+            async def on_session_updated(response):
+                print("Session updated successfully:", response)
+
+            async def on_speech_started(response):
+                nonlocal is_streaming
+                print("Interruption Occured:", response)
+                await openai_ws.send(RESPONSE_CANCEL_FRAME)
+                is_streaming = False
+
+            async def on_committed(response):
+                nonlocal is_streaming
+                print("Interruption Completed:", response)
+                # openai_ws.send(
+                #     json.dumps(
+                #         {"event_id": "testing123", "type": "response.cancel"}
+                #     )
+                # )
+                is_streaming = True
+                # await websocket.send_json("response.cancel")
+
+            media_frame_sid = None
+            media_frame_prefix = ""
+
+            async def forward_audio(audio_payload):
+                nonlocal media_frame_sid, media_frame_prefix
+                if audio_payload and is_streaming:
+                    # Audio from OpenAI
+                    try:
+                        if media_frame_prefix == "" or media_frame_sid != stream_sid:
+                            media_frame_sid = stream_sid
+                            media_frame_prefix = (
+                                '{"event":"media","streamSid":'
+                                + orjson.dumps(stream_sid).decode()
+                                + ',"media":{"payload":"'
+                            )
+                        # The delta is already base64, which is what Twilio expects,
+                        # and needs no JSON escaping.
+                        await websocket.send_text(media_frame_prefix + audio_payload + '"}}')
+                    except Exception as e:
+                        print(f"Error processing audio data: {e}")
+
+            async def on_audio_delta(response):
+                await forward_audio(response.get("delta"))
+
+            handlers = {
+                "session.updated": on_session_updated,
+                "input_audio_buffer.speech_started": on_speech_started,
+                "input_audio_buffer.committed": on_committed,
+                "response.audio.delta": on_audio_delta,
+            }
+
+            log_events = logger.isEnabledFor(logging.DEBUG)
+
             try:
                 async for openai_message in openai_ws:
-                    response = json.loads(openai_message)
-                    if response["type"] in LOG_EVENT_TYPES:
-                        print(f"Received event: {response['type']}", response)
-                    if response["type"] == "session.updated":
-                        print("Session updated successfully:", response)
-
-                    if response["type"] == "input_audio_buffer.speech_started":
-                        print("Interruption Occured:", response)
-                        openai_ws.send(
-                            json.dumps(
-                                {"event_id": "testing123", "type": "response.cancel"}
-                            )
-                        )
-                        is_streaming = False
-
-                    if response["type"] == "input_audio_buffer.committed":
-                        print("Interruption Completed:", response)
-                        # openai_ws.send(
-                        #     json.dumps(
-                        #         {"event_id": "testing123", "type": "response.cancel"}
-                        #     )
-                        # )
-                        is_streaming = True
-                        # await websocket.send_json("response.cancel")
-
-                    if response["type"] == "response.audio.delta" and response.get(
-                        "delta"
-                    ):
-                        if is_streaming:
-                            print("AUDIO DELTA HERE INCOMINGGG --------")
-                            # Audio from OpenAI
-                            try:
-                                audio_payload = base64.b64encode(
-                                    base64.b64decode(response["delta"])
-                                ).decode("utf-8")
-                                audio_delta = {
-                                    "event": "media",
-                                    "streamSid": stream_sid,
-                                    "media": {"payload": audio_payload},
-                                }
-                                await websocket.send_json(audio_delta)
-                            except Exception as e:
-                                print(f"Error processing audio data: {e}")
+                    # Audio deltas dominate the stream; skip the full parse for them
+                    audio_payload = extract_audio_delta(openai_message)
+                    if audio_payload is not None:
+                        await forward_audio(audio_payload)
+                        continue
+
+                    response = orjson.loads(openai_message)
+                    response_type = response["type"]
+                    if log_events and response_type in LOG_EVENT_TYPES:
+                        logger.debug("Received event: %s %s", response_type, response)
+
+                    handler = handlers.get(response_type)
+                    if handler is not None:
+                        await handler(response)
             except Exception as e:
                 print(f"Error in send_to_twilio: {e}")
 
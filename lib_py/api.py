@@ -1,9 +1,17 @@
 import asyncio
-import json
-from typing import Optional
+import orjson
+from typing import Any, Callable, Dict, Optional, Tuple
 import websockets
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.protocol import State
 from .event_handler import RealtimeEventHandler
-from .utils import RealtimeUtils
+
+INPUT_AUDIO_APPEND_FRAME = '{"event_id":"%s","type":"input_audio_buffer.append","audio":"%s"}'
+# Frame templates for control events that carry no payload besides their id
+STATIC_FRAMES = {
+    event_name: '{"event_id":"%s","type":"' + event_name + '"}'
+    for event_name in ("response.create", "response.cancel", "input_audio_buffer.commit")
+}
 
 class RealtimeAPI(RealtimeEventHandler):
     def __init__(
@@ -11,17 +19,25 @@ class RealtimeAPI(RealtimeEventHandler):
         url: Optional[str] = None,
         api_key: Optional[str] = None,
         dangerously_allow_api_key_in_browser: bool = False,
-        debug: bool = False
+        debug: bool = False,
+        send_queue_size: int = 256
     ):
         super().__init__()
         self.default_url = 'wss://api.openai.com/v1/realtime'
         self.url = url or self.default_url
         self.api_key = api_key
         self.debug = debug
-        self.ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.ws: Optional[ClientConnection] = None
+        self._event_count = 0
+        self.send_queue_size = send_queue_size
+        self._send_queue: Optional[asyncio.Queue] = None
+        # Set while fewer than send_queue_size frames are pending
+        self._send_ready: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._client_listening = False
 
     def is_connected(self) -> bool:
-        return self.ws is not None and self.ws.open
+        return self.ws is not None and self.ws.state is State.OPEN
 
     def log(self, *args):
         if self.debug:
@@ -40,9 +56,20 @@ class RealtimeAPI(RealtimeEventHandler):
             headers['OpenAI-Beta'] = 'realtime=v1'
 
         try:
-            self.ws = await websockets.connect(f"{self.url}?model={model}", extra_headers=headers)
+            # Base64 audio does not compress, and event sizes are bounded by the server
+            self.ws = await connect(
+                f"{self.url}?model={model}",
+                additional_headers=headers,
+                compression=None,
+                max_size=None,
+            )
             self.log(f'Connected to "{self.url}"')
 
+            # Unbounded so synchronous senders never fail; send() waits once send_queue_size frames are pending
+            self._send_queue = asyncio.Queue()
+            self._send_ready = asyncio.Event()
+            self._send_ready.set()
+            self._writer = asyncio.create_task(self._write(self.ws, self._send_queue, self._send_ready))
             asyncio.create_task(self._listen())
 
             return True
@@ -52,21 +79,105 @@ class RealtimeAPI(RealtimeEventHandler):
             raise ConnectionError(f'Could not connect to "{self.url}"') from e
 
     async def _listen(self):
+        writer = self._writer
         try:
-            async for message in self.ws:
-                event = json.loads(message)
-                await self._handle_message(event)
+            # Handlers are synchronous, so frames already buffered by the socket are
+            # parsed and dispatched back to back without yielding to the event loop.
+            # decode=False skips UTF-8 decoding of text frames; orjson validates the bytes.
+            while True:
+                message = await self.ws.recv(decode=False)
+                try:
+                    self._handle_message(orjson.loads(message))
+                except Exception as e:
+                    # A bad frame or a failing handler must not stop the connection's I/O
+                    print(f'Error handling message from "{self.url}": {e!r}')
+        except websockets.exceptions.ConnectionClosedOK:
+            writer.cancel()
         except websockets.exceptions.ConnectionClosed as e:
+            writer.cancel()
             self.log(f'Disconnected from "{self.url}": {e}')
-            await self.dispatch('close', {'error': True})
+            self.dispatch('close', {'error': True})
             self.ws = None
 
-    async def _handle_message(self, event: dict):
+    async def _write(self, ws: ClientConnection, queue: asyncio.Queue, ready: asyncio.Event):
+        # Single writer for the socket: frames go out in the order they were queued.
+        # A None frame from disconnect() stops it once everything queued before it is sent.
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    return
+                if queue.qsize() < self.send_queue_size:
+                    ready.set()
+                await ws.send(frame)
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            # Frames left behind can no longer be sent; discard them and release waiting senders
+            while not queue.empty():
+                queue.get_nowait()
+            ready.set()
+
+    def _handle_message(self, event: dict):
         event_type = event.get('type')
         if event_type:
-            await self.receive(event_type, event)
+            self.receive(event_type, event)
+
+    def receive(self, event_name: str, event: dict) -> bool:
+        if self.debug:
+            self.log(f"received: {event_name} {event}")
+        self.dispatch(f"server.{event_name}", event)
+        return True
+
+    def on(self, event_name: str, callback: Callable[[Dict[str, Any]], None]) -> Callable:
+        if event_name.startswith("client."):
+            self._client_listening = True
+        return super().on(event_name, callback)
+
+    def on_next(self, event_name: str, callback: Callable[[Dict[str, Any]], None]) -> Callable:
+        if event_name.startswith("client."):
+            self._client_listening = True
+        return super().on_next(event_name, callback)
+
+    def clear_event_handlers(self) -> bool:
+        self._client_listening = False
+        return super().clear_event_handlers()
 
     async def send(self, event_name: str, data: Optional[dict] = None) -> bool:
+        """
+        Queues an event for the socket writer, waiting while send_queue_size frames are pending.
+        """
+        while self._send_queue is not None and self._send_queue.qsize() >= self.send_queue_size:
+            await self._send_ready.wait()
+        return self.send_nowait(event_name, data)
+
+    def send_nowait(self, event_name: str, data: Optional[dict] = None) -> bool:
+        """
+        Queues an event for the socket writer without waiting.
+        The queue does not limit these calls; use send() where the caller can wait for the writer.
+        """
+        frame, event = self._build_frame(event_name, data)
+        self._send_queue.put_nowait(frame)
+        if self._send_queue.qsize() >= self.send_queue_size:
+            self._send_ready.clear()
+        self._notify_sent(event_name, frame, event)
+        return True
+
+    def _notify_sent(self, event_name: str, frame: str, event: Optional[Dict[str, Any]]):
+        # The flag stays set after listeners go away, so confirm one exists before parsing the frame
+        if not self.debug and not self._client_listening:
+            return
+        client_event_name = f"client.{event_name}"
+        if not self.debug and not self._has_listener(client_event_name):
+            return
+        # Templated frames skip building the event dict, so recover it only when someone reads it
+        if event is None:
+            event = orjson.loads(frame)
+        self.dispatch(client_event_name, event)
+        if self.debug:
+            self.log(f"sent: {event_name} {event}")
+
+    def _build_frame(self, event_name: str, data: Optional[dict]) -> Tuple[str, Optional[Dict[str, Any]]]:
         if not self.is_connected():
             raise ConnectionError("RealtimeAPI is not connected")
 
@@ -74,22 +185,39 @@ class RealtimeAPI(RealtimeEventHandler):
         if not isinstance(data, dict):
             raise ValueError("data must be a dictionary")
 
-        event = {
-            "event_id": RealtimeUtils.generate_id("evt_"),
-            "type": event_name,
-            **data
-        }
-
-        await self.ws.send(json.dumps(event))
-        self.dispatch(f"client.{event_name}", event)
-        self.log(f"sent: {event_name} {event}")
-        return True
+        self._event_count += 1
+        event_id = f"evt_{self._event_count}"
+        if not data and event_name in STATIC_FRAMES:
+            frame = STATIC_FRAMES[event_name] % event_id
+            event = None
+        elif event_name == "input_audio_buffer.append" and data.keys() == {"audio"}:
+            # Event ids and base64 audio are plain ASCII, so the frame needs no JSON encoding
+            frame = INPUT_AUDIO_APPEND_FRAME % (event_id, data["audio"])
+            event = None
+        else:
+            event = {
+                "event_id": event_id,
+                "type": event_name,
+                **data
+            }
+            frame = orjson.dumps(event).decode()
+        return frame, event
 
     async def disconnect(self):
         if self.ws:
+            # Let the writer send everything queued so far before closing the socket,
+            # giving it as long as the close handshake itself may take
+            self._send_queue.put_nowait(None)
+            await asyncio.wait([self._writer], timeout=self.ws.close_timeout)
+            if not self._writer.done():
+                # The server stopped reading, so the close handshake would stall as well;
+                # drop the connection and let _listen report the abnormal close
+                self._writer.cancel()
+                self.ws.transport.abort()
+                return True
             await self.ws.close()
             self.ws = None
             self.log(f'Disconnected from "{self.url}"')
-            await self.dispatch('close', {'error': False})
+            self.dispatch('close', {'error': False})
             return True
         return False
\ No newline at end of file
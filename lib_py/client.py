@@ -1,5 +1,4 @@
 import asyncio
-import json
 from typing import Optional, Dict, Any, Callable, List, Union
 from .event_handler import RealtimeEventHandler
 from .api import RealtimeAPI
@@ -45,6 +44,9 @@ UsageType = Dict[str, int]
 
 ResponseResourceType = Dict[str, Any]
 
+# Audio content larger than this is base64-encoded in a worker thread instead of on the event loop
+THREADED_ENCODE_MIN_BYTES = 64_000
+
 
 class RealtimeClient(RealtimeEventHandler):
     """
@@ -59,19 +61,7 @@ class RealtimeClient(RealtimeEventHandler):
         debug: bool = False,
     ):
         super().__init__()
-        self.default_session_config: Dict[str, Any] = {
-            "modalities": ["text", "audio"],
-            "instructions": "",
-            "voice": "alloy",
-            "input_audio_format": "pcm16",
-            "output_audio_format": "pcm16",
-            "input_audio_transcription": None,
-            "turn_detection": None,
-            "tools": [],
-            "tool_choice": "auto",
-            "temperature": 0.8,
-            "max_response_output_tokens": 4096,
-        }
+        self.default_session_config: Dict[str, Any] = self._default_session_config()
         self.session_config: Dict[str, Any] = {}
         self.transcription_models: List[Dict[str, str]] = [
             {"model": "whisper-1"},
@@ -90,18 +80,42 @@ class RealtimeClient(RealtimeEventHandler):
         )
         self.conversation = RealtimeConversation()
         self.tools: Dict[str, Dict[str, Callable]] = {}
-        self.input_audio_buffer: bytes = b""
+        self._tools_rev: int = 0
+        self._formatted_tools_rev: int = -1
+        self._formatted_tools: List[ToolDefinitionType] = []
+        self.input_audio_buffer: bytearray = bytearray()
+        self._send_tasks: set = set()
         self._reset_config()
         self._add_api_event_handlers()
 
+    @staticmethod
+    def _default_session_config() -> Dict[str, Any]:
+        """
+        Returns a fresh copy of the default session configuration.
+        """
+        return {
+            "modalities": ["text", "audio"],
+            "instructions": "",
+            "voice": "alloy",
+            "input_audio_format": "pcm16",
+            "output_audio_format": "pcm16",
+            "input_audio_transcription": None,
+            "turn_detection": None,
+            "tools": [],
+            "tool_choice": "auto",
+            "temperature": 0.8,
+            "max_response_output_tokens": 4096,
+        }
+
     def _reset_config(self) -> bool:
         """
         Resets sessionConfig and related configurations to default.
         """
         self.session_created: bool = False
         self.tools = {}
-        self.session_config = json.loads(json.dumps(self.default_session_config))
-        self.input_audio_buffer = b""
+        self._tools_rev += 1
+        self.session_config = self._default_session_config()
+        self.input_audio_buffer = bytearray()
         return True
 
     def _add_api_event_handlers(self):
@@ -140,6 +154,7 @@ class RealtimeClient(RealtimeEventHandler):
         if not callable(handler):
             raise ValueError(f'Tool "{name}" handler must be a function')
         self.tools[name] = {"definition": definition, "handler": handler}
+        self._tools_rev += 1
         self.update_session()
         return self.tools[name]
 
@@ -150,13 +165,23 @@ class RealtimeClient(RealtimeEventHandler):
         if name not in self.tools:
             raise ValueError(f'Tool "{name}" does not exist, cannot be removed.')
         del self.tools[name]
+        self._tools_rev += 1
         return True
 
+    def _get_formatted_tools(self) -> List[ToolDefinitionType]:
+        """
+        Returns the session definitions of the added tools, rebuilt only after tools change.
+        """
+        if self._formatted_tools_rev != self._tools_rev:
+            self._formatted_tools = [{"type": "function", **tool["definition"]} for tool in self.tools.values()]
+            self._formatted_tools_rev = self._tools_rev
+        return self._formatted_tools
+
     def delete_item(self, id: str) -> bool:
         """
         Deletes an item by ID.
         """
-        self.realtime.send("conversation.item.delete", {"item_id": id})
+        self.realtime.send_nowait("conversation.item.delete", {"item_id": id})
         return True
 
     def update_session(
@@ -176,76 +201,114 @@ class RealtimeClient(RealtimeEventHandler):
         """
         Updates session configuration and sends the update to the server if connected.
         """
-        if modalities is not None:
-            self.session_config["modalities"] = modalities
-        if instructions is not None:
-            self.session_config["instructions"] = instructions
-        if voice is not None:
-            self.session_config["voice"] = voice
-        if input_audio_format is not None:
-            self.session_config["input_audio_format"] = input_audio_format
-        if output_audio_format is not None:
-            self.session_config["output_audio_format"] = output_audio_format
-        if input_audio_transcription is not None:
-            self.session_config["input_audio_transcription"] = input_audio_transcription
-        if turn_detection is not None:
-            self.session_config["turn_detection"] = turn_detection
-        if tools is not None:
-            self.session_config["tools"] = tools
-        if tool_choice is not None:
-            self.session_config["tool_choice"] = tool_choice
-        if temperature is not None:
-            self.session_config["temperature"] = temperature
-        if max_response_output_tokens is not None:
-            self.session_config["max_response_output_tokens"] = max_response_output_tokens
+        updates = {
+            "modalities": modalities,
+            "instructions": instructions,
+            "voice": voice,
+            "input_audio_format": input_audio_format,
+            "output_audio_format": output_audio_format,
+            "input_audio_transcription": input_audio_transcription,
+            "turn_detection": turn_detection,
+            "tools": tools,
+            "tool_choice": tool_choice,
+            "temperature": temperature,
+            "max_response_output_tokens": max_response_output_tokens,
+        }
+        self.session_config.update({k: v for k, v in updates.items() if v is not None})
 
         # Load tools from tool definitions + already loaded tools
-        use_tools = []
-        for tool_def in tools or []:
-            definition = {"type": "function", **tool_def}
-            if definition["name"] in self.tools:
-                raise ValueError(f'Tool "{definition["name"]}" has already been defined')
-            use_tools.append(definition)
-        for tool in self.tools.values():
-            use_tools.append({"type": "function", **tool["definition"]})
+        if tools is None:
+            use_tools = self._get_formatted_tools()
+        else:
+            use_tools = []
+            for tool_def in tools:
+                definition = {"type": "function", **tool_def}
+                if definition["name"] in self.tools:
+                    raise ValueError(f'Tool "{definition["name"]}" has already been defined')
+                use_tools.append(definition)
+            use_tools.extend(self._get_formatted_tools())
         session = self.session_config.copy()
         session["tools"] = use_tools
 
         if self.realtime.is_connected():
-            asyncio.create_task(self.realtime.send("session.update", {"session": session}))
+            self.realtime.send_nowait("session.update", {"session": session})
         return True
 
     def send_user_message_content(self, content: List[Union[InputTextContentType, InputAudioContentType]] = []) -> bool:
         """
         Sends user message content and initiates a response creation.
+        Audio larger than THREADED_ENCODE_MIN_BYTES is handed to send_user_message_content_async
+        in the background, so events sent right after this call can reach the server first;
+        await send_user_message_content_async directly when that ordering matters.
+        """
+        if content:
+            audio_contents = [
+                c for c in content
+                if c["type"] == "input_audio" and isinstance(c.get("audio"), (bytes, bytearray))
+            ]
+            if any(len(c["audio"]) > THREADED_ENCODE_MIN_BYTES for c in audio_contents):
+                task = asyncio.create_task(self.send_user_message_content_async(content))
+                # Hold a reference until the task finishes so it can't be garbage collected mid-send
+                self._send_tasks.add(task)
+                task.add_done_callback(self._on_send_task_done)
+                return True
+            for c in audio_contents:
+                c["audio"] = RealtimeUtils.array_buffer_to_base64(c["audio"])
+            self.realtime.send_nowait("conversation.item.create", self._user_message_item(content))
+        self.create_response()
+        return True
+
+    async def send_user_message_content_async(self, content: List[Union[InputTextContentType, InputAudioContentType]] = []) -> bool:
+        """
+        Sends user message content and initiates a response creation, encoding large audio in a worker thread.
         """
         if content:
             for c in content:
-                if c["type"] == "input_audio":
-                    if isinstance(c.get("audio"), (bytes, bytearray)):
+                if c["type"] == "input_audio" and isinstance(c.get("audio"), (bytes, bytearray)):
+                    if len(c["audio"]) > THREADED_ENCODE_MIN_BYTES:
+                        c["audio"] = await asyncio.to_thread(RealtimeUtils.array_buffer_to_base64, c["audio"])
+                    else:
                         c["audio"] = RealtimeUtils.array_buffer_to_base64(c["audio"])
-            asyncio.create_task(
-                self.realtime.send("conversation.item.create", {
-                    "item": {
-                        "type": "message",
-                        "role": "user",
-                        "content": content,
-                    }
-                })
-            )
+            await self.realtime.send("conversation.item.create", self._user_message_item(content))
         self.create_response()
         return True
 
-    def append_input_audio(self, array_buffer: Union[bytes, bytearray]) -> bool:
+    def _on_send_task_done(self, task: asyncio.Task):
+        self._send_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error sending user message content: {task.exception()!r}")
+
+    @staticmethod
+    def _user_message_item(content: List[Union[InputTextContentType, InputAudioContentType]]) -> Dict[str, Any]:
+        return {
+            "item": {
+                "type": "message",
+                "role": "user",
+                "content": content,
+            }
+        }
+
+    def append_input_audio(self, array_buffer: Union[bytes, bytearray, memoryview]) -> bool:
         """
         Appends user audio to the existing audio buffer and sends it to the server.
+        Accepts any contiguous buffer (e.g. a NumPy array) without copying it first.
         """
-        if len(array_buffer) > 0:
-            encoded_audio = RealtimeUtils.array_buffer_to_base64(array_buffer)
-            asyncio.create_task(
-                self.realtime.send("input_audio_buffer.append", {"audio": encoded_audio})
-            )
-            self.input_audio_buffer += array_buffer
+        audio = memoryview(array_buffer).cast("B")
+        if audio.nbytes > 0:
+            encoded_audio = RealtimeUtils.array_buffer_to_base64(audio)
+            self.realtime.send_nowait("input_audio_buffer.append", {"audio": encoded_audio})
+            self.input_audio_buffer.extend(audio)
+        return True
+
+    async def append_input_audio_async(self, array_buffer: Union[bytes, bytearray, memoryview]) -> bool:
+        """
+        Appends user audio like append_input_audio, waiting while the send queue is full.
+        """
+        audio = memoryview(array_buffer).cast("B")
+        if audio.nbytes > 0:
+            encoded_audio = RealtimeUtils.array_buffer_to_base64(audio)
+            await self.realtime.send("input_audio_buffer.append", {"audio": encoded_audio})
+            self.input_audio_buffer.extend(audio)
         return True
 
     def create_response(self) -> bool:
@@ -253,10 +316,10 @@ class RealtimeClient(RealtimeEventHandler):
         Forces a model response generation based on the current input audio buffer.
         """
         if self.get_turn_detection_type() is None and len(self.input_audio_buffer) > 0:
-            asyncio.create_task(self.realtime.send("input_audio_buffer.commit"))
-            self.conversation.queue_input_audio(self.input_audio_buffer)
-            self.input_audio_buffer = b""
-        asyncio.create_task(self.realtime.send("response.create"))
+            self.realtime.send_nowait("input_audio_buffer.commit")
+            self.conversation.queue_input_audio(bytes(self.input_audio_buffer))
+            self.input_audio_buffer.clear()
+        self.realtime.send_nowait("response.create")
         return True
 
     def cancel_response(self, id: Optional[str] = None, sample_count: int = 0) -> Dict[str, Optional[AssistantItemType]]:
@@ -264,7 +327,7 @@ class RealtimeClient(RealtimeEventHandler):
         Cancels the ongoing server generation and truncates ongoing generation, if applicable.
         """
         if not id:
-            asyncio.create_task(self.realtime.send("response.cancel"))
+            self.realtime.send_nowait("response.cancel")
             return {"item": None}
         else:
             item = self.conversation.get_item(id)
@@ -275,7 +338,7 @@ class RealtimeClient(RealtimeEventHandler):
             if item.get("role") != "assistant":
                 raise ValueError('Can only cancelResponse messages with role "assistant"')
 
-            asyncio.create_task(self.realtime.send("response.cancel"))
+            self.realtime.send_nowait("response.cancel")
 
             audio_index = next(
                 (index for index, c in enumerate(item.get("content", [])) if c.get("type") == "audio"),
@@ -285,13 +348,11 @@ class RealtimeClient(RealtimeEventHandler):
                 raise ValueError('Could not find audio on item to cancel')
 
             audio_end_ms = int((sample_count / self.conversation.default_frequency) * 1000)
-            asyncio.create_task(
-                self.realtime.send("conversation.item.truncate", {
-                    "item_id": id,
-                    "content_index": audio_index,
-                    "audio_end_ms": audio_end_ms,
-                })
-            )
+            self.realtime.send_nowait("conversation.item.truncate", {
+                "item_id": id,
+                "content_index": audio_index,
+                "audio_end_ms": audio_end_ms,
+            })
             return {"item": item}
 
     async def wait_for_next_item(self) -> Dict[str, Any]:
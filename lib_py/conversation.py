@@ -1,34 +1,26 @@
-import copy
+import pybase64
 from typing import Optional, Dict, Any, Tuple
-from .utils import RealtimeUtils
 
 ItemContentDeltaType = Dict[str, Any]
 
+def _clone_json(obj: Any) -> Any:
+    # Events are decoded JSON, so only dicts and lists need copying; the leaves are immutable
+    if isinstance(obj, dict):
+        return {k: _clone_json(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_clone_json(v) for v in obj]
+    return obj
+
 class RealtimeConversation:
     def __init__(self):
         self.default_frequency = 24000  # 24,000 Hz
+        # Audio is 16-bit PCM, so each millisecond spans two bytes per sample
+        self._bytes_per_ms = self.default_frequency // 1000 * 2
         self.clear()
 
-        self.event_processors = {
-            'conversation.item.created': self._process_item_created,
-            'conversation.item.truncated': self._process_item_truncated,
-            'conversation.item.deleted': self._process_item_deleted,
-            'conversation.item.input_audio_transcription.completed': self._process_input_audio_transcription_completed,
-            'input_audio_buffer.speech_started': self._process_speech_started,
-            'input_audio_buffer.speech_stopped': self._process_speech_stopped,
-            'response.created': self._process_response_created,
-            'response.output_item.added': self._process_response_output_item_added,
-            'response.output_item.done': self._process_response_output_item_done,
-            'response.content_part.added': self._process_response_content_part_added,
-            'response.audio_transcript.delta': self._process_response_audio_transcript_delta,
-            'response.audio.delta': self._process_response_audio_delta,
-            'response.text.delta': self._process_response_text_delta,
-            'response.function_call_arguments.delta': self._process_response_function_call_arguments_delta,
-        }
-
     def clear(self) -> bool:
+        # Insertion-ordered, so it doubles as the ordered item list
         self.item_lookup: Dict[str, Dict[str, Any]] = {}
-        self.items: list = []
         self.response_lookup: Dict[str, Dict[str, Any]] = {}
         self.responses: list = []
         self.queued_speech_items: Dict[str, Dict[str, Any]] = {}
@@ -41,39 +33,42 @@ class RealtimeConversation:
         return input_audio
 
     def process_event(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        if 'event_id' not in event:
-            raise ValueError('Missing "event_id" on event')
-        if 'type' not in event:
-            raise ValueError('Missing "type" on event')
-
-        event_type = event['type']
-        processor = self.event_processors.get(event_type)
-        if not processor:
+        try:
+            event['event_id']
+            event_type = event['type']
+        except KeyError as e:
+            raise ValueError(f'Missing "{e.args[0]}" on event') from None
+
+        entry = self._EVENT_PROCESSORS.get(event_type)
+        if entry is None:
             raise ValueError(f'Missing conversation event processor for "{event_type}"')
-        
-        return processor(event, *args)
+
+        processor, required_fields = entry
+        for field in required_fields:
+            if field not in event:
+                raise ValueError(f'Missing "{field}" on "{event_type}" event')
+        return processor(self, event, *args)
 
     def get_item(self, id: str) -> Optional[Dict[str, Any]]:
         return self.item_lookup.get(id)
 
     def get_items(self) -> list:
-        return self.items.copy()
+        return list(self.item_lookup.values())
 
     # Event Processor Methods
     def _process_item_created(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item = copy.deepcopy(event.get('item', {}))
+        item = _clone_json(event['item'])
         if item['id'] not in self.item_lookup:
             self.item_lookup[item['id']] = item
-            self.items.append(item)
 
         item['formatted'] = {
-            'audio': b'',
+            'audio': bytearray(),
             'text': '',
             'transcript': ''
         }
 
         if item['id'] in self.queued_speech_items:
-            item['formatted']['audio'] = self.queued_speech_items[item['id']]['audio']
+            item['formatted']['audio'] = bytearray(self.queued_speech_items[item['id']]['audio'])
             del self.queued_speech_items[item['id']]
 
         if 'content' in item:
@@ -89,7 +84,7 @@ class RealtimeConversation:
             if item.get('role') == 'user':
                 item['status'] = 'completed'
                 if self.queued_input_audio:
-                    item['formatted']['audio'] = self.queued_input_audio
+                    item['formatted']['audio'] = bytearray(self.queued_input_audio)
                     self.queued_input_audio = None
             else:
                 item['status'] = 'in_progress'
@@ -108,31 +103,29 @@ class RealtimeConversation:
         return {'item': item, 'delta': None}
 
     def _process_item_truncated(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        audio_end_ms = event.get('audio_end_ms')
+        item_id = event['item_id']
+        audio_end_ms = event['audio_end_ms']
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'item.truncated: Item "{item_id}" not found')
 
-        end_index = (audio_end_ms * self.default_frequency) // 1000
+        end_index = audio_end_ms * self._bytes_per_ms
         item['formatted']['transcript'] = ''
-        item['formatted']['audio'] = item['formatted']['audio'][:end_index]
+        del item['formatted']['audio'][end_index:]
         return {'item': item, 'delta': None}
 
     def _process_item_deleted(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
+        item_id = event['item_id']
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'item.deleted: Item "{item_id}" not found')
 
         del self.item_lookup[item_id]
-        if item in self.items:
-            self.items.remove(item)
         return {'item': item, 'delta': None}
 
     def _process_input_audio_transcription_completed(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        content_index = event.get('content_index')
+        item_id = event['item_id']
+        content_index = event['content_index']
         transcript = event.get('transcript', ' ')
 
         item = self.item_lookup.get(item_id)
@@ -146,36 +139,36 @@ class RealtimeConversation:
             return {'item': item, 'delta': {'transcript': transcript}}
 
     def _process_speech_started(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        audio_start_ms = event.get('audio_start_ms')
+        item_id = event['item_id']
+        audio_start_ms = event['audio_start_ms']
         self.queued_speech_items[item_id] = {'audio_start_ms': audio_start_ms}
         return {'item': None, 'delta': None}
 
     def _process_speech_stopped(self, event: Dict[str, Any], input_audio_buffer: Optional[bytes] = None) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        audio_end_ms = event.get('audio_end_ms')
+        item_id = event['item_id']
+        audio_end_ms = event['audio_end_ms']
         speech = self.queued_speech_items.get(item_id)
         if not speech:
             return {'item': None, 'delta': None}
 
         speech['audio_end_ms'] = audio_end_ms
         if input_audio_buffer:
-            start_index = (speech['audio_start_ms'] * self.default_frequency) // 1000
-            end_index = (speech['audio_end_ms'] * self.default_frequency) // 1000
+            start_index = speech['audio_start_ms'] * self._bytes_per_ms
+            end_index = speech['audio_end_ms'] * self._bytes_per_ms
             speech['audio'] = input_audio_buffer[start_index:end_index]
 
         return {'item': None, 'delta': None}
 
     def _process_response_created(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        response = event.get('response', {})
+        response = event['response']
         if response.get('id') not in self.response_lookup:
             self.response_lookup[response['id']] = response
             self.responses.append(response)
         return {'item': None, 'delta': None}
 
     def _process_response_output_item_added(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        response_id = event.get('response_id')
-        item = event.get('item')
+        response_id = event['response_id']
+        item = event['item']
         response = self.response_lookup.get(response_id)
         if not response:
             raise ValueError(f'response.output_item.added: Response "{response_id}" not found')
@@ -195,8 +188,8 @@ class RealtimeConversation:
         return {'item': found_item, 'delta': None}
 
     def _process_response_content_part_added(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        part = event.get('part', {})
+        item_id = event['item_id']
+        part = event['part']
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'response.content_part.added: Item "{item_id}" not found')
@@ -204,54 +197,76 @@ class RealtimeConversation:
         return {'item': item, 'delta': None}
 
     def _process_response_audio_transcript_delta(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        content_index = event.get('content_index')
+        item_id = event['item_id']
+        content_index = event['content_index']
         delta = event.get('delta', '')
 
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'response.audio_transcript.delta: Item "{item_id}" not found')
 
-        transcript_field = item['content'][content_index].get('transcript', '')
-        item['content'][content_index]['transcript'] = transcript_field + delta
-        item['formatted']['transcript'] = item['formatted'].get('transcript', '') + delta
+        content = item['content'][content_index]
+        formatted = item['formatted']
+        content['transcript'] = content.get('transcript', '') + delta
+        formatted['transcript'] += delta
         return {'item': item, 'delta': {'transcript': delta}}
 
     def _process_response_audio_delta(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        content_index = event.get('content_index')
+        item_id = event['item_id']
         delta = event.get('delta', '')
 
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'response.audio.delta: Item "{item_id}" not found')
 
-        array_buffer = RealtimeUtils.base64_to_array_buffer(delta)
-        append_values = array_buffer  # Assuming bytes for audio
-        item['formatted']['audio'] = RealtimeUtils.merge_int16_arrays(item['formatted']['audio'], append_values)
-        return {'item': item, 'delta': {'audio': append_values}}
+        # Server audio is canonical base64, so take pybase64's validating fast path
+        array_buffer = pybase64.b64decode(delta, validate=True)
+        item['formatted']['audio'] += array_buffer
+        return {'item': item, 'delta': {'audio': array_buffer}}
 
     def _process_response_text_delta(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
-        content_index = event.get('content_index')
+        item_id = event['item_id']
+        content_index = event['content_index']
         delta = event.get('delta', '')
 
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'response.text.delta: Item "{item_id}" not found')
 
-        item['content'][content_index]['text'] += delta
-        item['formatted']['text'] = item['formatted'].get('text', '') + delta
+        content = item['content'][content_index]
+        formatted = item['formatted']
+        content['text'] += delta
+        formatted['text'] += delta
         return {'item': item, 'delta': {'text': delta}}
 
     def _process_response_function_call_arguments_delta(self, event: Dict[str, Any], *args) -> Tuple[Optional[Dict[str, Any]], Optional[ItemContentDeltaType]]:
-        item_id = event.get('item_id')
+        item_id = event['item_id']
         delta = event.get('delta', '')
 
         item = self.item_lookup.get(item_id)
         if not item:
             raise ValueError(f'response.function_call_arguments.delta: Item "{item_id}" not found')
 
+        tool = item['formatted']['tool']
         item['arguments'] += delta
-        item['formatted']['tool']['arguments'] += delta
-        return {'item': item, 'delta': {'arguments': delta}}
\ No newline at end of file
+        tool['arguments'] += delta
+        return {'item': item, 'delta': {'arguments': delta}}
+
+    # Built once for the class; processors are plain functions called with the instance,
+    # listed with the event fields they index directly
+    _EVENT_PROCESSORS = {
+        'conversation.item.created': (_process_item_created, ('item',)),
+        'conversation.item.truncated': (_process_item_truncated, ('item_id', 'audio_end_ms')),
+        'conversation.item.deleted': (_process_item_deleted, ('item_id',)),
+        'conversation.item.input_audio_transcription.completed': (_process_input_audio_transcription_completed, ('item_id', 'content_index')),
+        'input_audio_buffer.speech_started': (_process_speech_started, ('item_id', 'audio_start_ms')),
+        'input_audio_buffer.speech_stopped': (_process_speech_stopped, ('item_id', 'audio_end_ms')),
+        'response.created': (_process_response_created, ('response',)),
+        'response.output_item.added': (_process_response_output_item_added, ('response_id', 'item')),
+        'response.output_item.done': (_process_response_output_item_done, ()),
+        'response.content_part.added': (_process_response_content_part_added, ('item_id', 'part')),
+        'response.audio_transcript.delta': (_process_response_audio_transcript_delta, ('item_id', 'content_index')),
+        'response.audio.delta': (_process_response_audio_delta, ('item_id',)),
+        'response.text.delta': (_process_response_text_delta, ('item_id', 'content_index')),
+        'response.function_call_arguments.delta': (_process_response_function_call_arguments_delta, ('item_id',)),
+    }
\ No newline at end of file
@@ -1,13 +1,14 @@
 import asyncio
-from typing import Callable, Dict, List, Any, Optional
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, List, Any, Optional
 
 async def sleep(t: float):
     await asyncio.sleep(t)
 
 class RealtimeEventHandler:
     def __init__(self):
-        self.event_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
-        self.next_event_handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self.event_handlers: DefaultDict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
+        self.next_event_handlers: DefaultDict[str, List[Callable[[Dict[str, Any]], None]]] = defaultdict(list)
 
     def clear_event_handlers(self) -> bool:
         self.event_handlers.clear()
@@ -15,14 +16,10 @@ class RealtimeEventHandler:
         return True
 
     def on(self, event_name: str, callback: Callable[[Dict[str, Any]], None]) -> Callable:
-        if event_name not in self.event_handlers:
-            self.event_handlers[event_name] = []
         self.event_handlers[event_name].append(callback)
         return callback
 
     def on_next(self, event_name: str, callback: Callable[[Dict[str, Any]], None]) -> Callable:
-        if event_name not in self.next_event_handlers:
-            self.next_event_handlers[event_name] = []
         self.next_event_handlers[event_name].append(callback)
         return callback
 
@@ -48,6 +45,9 @@ class RealtimeEventHandler:
             self.next_event_handlers.pop(event_name, None)
         return True
 
+    def _has_listener(self, event_name: str) -> bool:
+        return bool(self.event_handlers.get(event_name) or self.next_event_handlers.get(event_name))
+
     async def wait_for_next(self, event_name: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         next_event = None
         event_future = asyncio.get_event_loop().create_future()
@@ -67,15 +67,16 @@ class RealtimeEventHandler:
         return next_event
 
     def dispatch(self, event_name: str, event: Dict[str, Any]) -> bool:
-        handlers = self.event_handlers.get(event_name, []).copy()
-        for handler in handlers:
+        handlers = self.event_handlers.get(event_name)
+        if not handlers and not self.next_event_handlers.get(event_name):
+            return True
+
+        # Snapshot so handlers that call on() or off() for this event only affect later dispatches
+        for handler in tuple(handlers or ()):
             handler(event)
 
-        next_handlers = self.next_event_handlers.get(event_name, []).copy()
-        for next_handler in next_handlers:
+        # Detach the next handlers before calling them so any they register stay for the next event
+        for next_handler in self.next_event_handlers.pop(event_name, ()):
             next_handler(event)
 
-        if event_name in self.next_event_handlers:
-            del self.next_event_handlers[event_name]
-
         return True
\ No newline at end of file
@@ -1,35 +1,58 @@
-import base64
-import random
+import os
+import numpy as np
+import pybase64
 from typing import Union
 
+# Samples converted per pass in float_to_16bit_pcm; 16384 float64 samples fit in L2
+_PCM_BLOCK_SAMPLES = 16384
+
+_ID_CHARS = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+# Maps every random byte to an id character in one bytes.translate call (slightly biased, fine for ids)
+_ID_TABLE = bytes(_ID_CHARS[i % len(_ID_CHARS)] for i in range(256))
+
 class RealtimeUtils:
     @staticmethod
-    def float_to_16bit_pcm(float32_array: list) -> bytes:
-        buffer = bytearray()
-        for s in float32_array:
-            s = max(-1.0, min(1.0, s))
-            int_val = int(s * 32768) if s < 0 else int(s * 32767)
-            buffer += int_val.to_bytes(2, byteorder='little', signed=True)
-        return bytes(buffer)
+    def float_to_16bit_pcm(float32_array: Union[list, np.ndarray]) -> bytes:
+        # Scale in float64 so truncation matches Python float arithmetic sample for sample.
+        # Work through cache-sized blocks with reused scratch buffers, so clamp, scale and
+        # cast stream through the cache instead of each making a pass over main memory.
+        samples = np.asarray(float32_array, dtype=np.float64)
+        total = samples.shape[0]
+        pcm = np.empty(total, dtype='<i2')
+        block = np.empty(min(_PCM_BLOCK_SAMPLES, total))
+        scale = np.empty_like(block)
+        for start in range(0, total, _PCM_BLOCK_SAMPLES):
+            chunk = samples[start:start + _PCM_BLOCK_SAMPLES]
+            size = chunk.shape[0]
+            clamped = block[:size]
+            chunk_scale = scale[:size]
+            np.clip(chunk, -1.0, 1.0, out=clamped)
+            np.less(clamped, 0, out=chunk_scale)
+            chunk_scale += 32767.0  # 32768 for negative samples, 32767 otherwise
+            clamped *= chunk_scale
+            pcm[start:start + size] = clamped
+        return pcm.tobytes()
 
     @staticmethod
     def base64_to_array_buffer(base64_str: str) -> bytes:
-        return base64.b64decode(base64_str)
+        return pybase64.b64decode(base64_str)
 
     @staticmethod
-    def array_buffer_to_base64(array_buffer: Union[bytes, bytearray]) -> str:
-        return base64.b64encode(array_buffer).decode('ascii')
+    def array_buffer_to_base64(array_buffer: Union[bytes, bytearray, memoryview]) -> str:
+        return pybase64.b64encode_as_string(array_buffer)
 
     @staticmethod
-    def merge_int16_arrays(left: bytes, right: bytes) -> bytes:
-        if not isinstance(left, bytes) or not isinstance(right, bytes):
-            raise ValueError("Both left and right must be bytes representing Int16Arrays")
-        return left + right
+    def merge_int16_arrays(
+        left: Union[bytes, bytearray], right: Union[bytes, bytearray, memoryview]
+    ) -> Union[bytes, bytearray]:
+        # A bytearray is extended in place (amortized O(1)); bytes fall back to a concatenated copy.
+        # Any buffer-protocol object is accepted on the right.
+        left += right
+        return left
 
     @staticmethod
     def generate_id(prefix: str, length: int = 21) -> str:
         if length <= len(prefix):
             raise ValueError("Length must be greater than the length of the prefix")
-        chars = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
-        str_suffix = ''.join(random.choice(chars) for _ in range(length - len(prefix)))
+        str_suffix = os.urandom(length - len(prefix)).translate(_ID_TABLE).decode('ascii')
         return f"{prefix}{str_suffix}"
\ No newline at end of file
@@ -1,7 +1,7 @@
 import os
-import json
-import base64
 import asyncio
+import orjson
+import pybase64
 import websockets
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.responses import HTMLResponse
@@ -22,11 +22,30 @@ SYSTEM_MESSAGE = (
     "Always stay positive, but work in a joke when appropriate."
 )
 VOICE = 'alloy'
-LOG_EVENT_TYPES = [
+# Twilio media frames arriving within this window are sent to OpenAI as one append; 0 disables batching.
+# Twilio sends a frame every 20 ms, so only windows longer than that combine frames.
+MEDIA_BATCH_MS = int(os.getenv('MEDIA_BATCH_MS', 0))
+LOG_EVENT_TYPES = frozenset({
     'response.content.done', 'rate_limits.updated', 'response.done',
     'input_audio_buffer.committed', 'input_audio_buffer.speech_stopped',
     'input_audio_buffer.speech_started', 'session.created'
-]
+})
+# The session settings are fixed at import, so the frame is serialized once for every call
+SESSION_UPDATE_FRAME = orjson.dumps({
+    "type": "session.update",
+    "session": {
+        "turn_detection": {"type": "server_vad"},
+        "input_audio_format": "g711_ulaw",
+        "output_audio_format": "g711_ulaw",
+        "voice": VOICE,
+        "instructions": SYSTEM_MESSAGE,
+        "modalities": ["text", "audio"],
+        "temperature": 0.8,
+        "input_audio_transcription": {"model": "whisper-1"},
+
+    }
+}).decode()
+RESPONSE_CANCEL_TEMPLATE = '{"event_id":"event_%s","type":"response.cancel"}'
 
 app = FastAPI()
 
@@ -67,19 +86,59 @@ async def handle_media_stream(websocket: WebSocket):
         extra_headers={
             "Authorization": f"Bearer {OPENAI_API_KEY}",
             "OpenAI-Beta": "realtime=v1"
-        }
+        },
+        compression=None,
+        max_size=None,
     ) as openai_ws:
         await send_session_update(openai_ws)
         stream_sid = None
         ai_generating_response = False
         user_speaking = False
+        loop = asyncio.get_running_loop()
+        media_buffer = bytearray()
+        media_flush_handle = None
+        media_flush_tasks = set()
+
+        async def flush_media():
+            """Send the buffered Twilio audio to OpenAI as a single input_audio_buffer.append."""
+            nonlocal media_flush_handle
+            if media_flush_handle is not None:
+                media_flush_handle.cancel()
+                media_flush_handle = None
+            if media_buffer:
+                audio_append = {
+                    "type": "input_audio_buffer.append",
+                    "audio": pybase64.b64encode_as_string(media_buffer)
+                }
+                media_buffer.clear()
+                await openai_ws.send(orjson.dumps(audio_append).decode())
+
+        def on_media_flush_done(task):
+            media_flush_tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                print(f"Error sending buffered media: {task.exception()!r}")
+
+        def schedule_media_flush():
+            # Hold a reference to every flush until it finishes so none is garbage collected mid-send
+            task = asyncio.create_task(flush_media())
+            media_flush_tasks.add(task)
+            task.add_done_callback(on_media_flush_done)
+
+        def cancel_media_flush():
+            """Drop any pending flush so it can't run against a closed OpenAI socket."""
+            nonlocal media_flush_handle
+            if media_flush_handle is not None:
+                media_flush_handle.cancel()
+                media_flush_handle = None
+            for task in media_flush_tasks:
+                task.cancel()
 
         async def receive_from_twilio():
             """Receive audio data from Twilio and send it to the OpenAI Realtime API."""
             nonlocal stream_sid, ai_generating_response, user_speaking
             try:
                 async for message in websocket.iter_text():
-                    data = json.loads(message)
+                    data = orjson.loads(message)
                     event_type = data.get('event')
 
                     if event_type == 'start':
@@ -88,19 +147,27 @@ async def handle_media_stream(websocket: WebSocket):
 
                     elif event_type == 'media':
                         payload = data['media']['payload']
-                        audio_append = {
-                            "type": "input_audio_buffer.append",
-                            "audio": payload
-                        }
-                        await openai_ws.send(json.dumps(audio_append))
+                        if MEDIA_BATCH_MS:
+                            # Base64 chunks can't be concatenated, so buffer the decoded audio
+                            media_buffer.extend(pybase64.b64decode(payload))
+                            if media_flush_handle is None:
+                                media_flush_handle = loop.call_later(MEDIA_BATCH_MS / 1000, schedule_media_flush)
+                        else:
+                            audio_append = {
+                                "type": "input_audio_buffer.append",
+                                "audio": payload
+                            }
+                            await openai_ws.send(orjson.dumps(audio_append).decode())
 
                         if user_speaking and ai_generating_response:
                             print("Interruption detected in Twilio stream. Sending response.cancel.")
+                            await flush_media()
                             await send_response_cancel(openai_ws)
                             ai_generating_response = False
 
                     elif event_type == 'stop':
                         print("Incoming stream has stopped.")
+                        await flush_media()
                         if openai_ws.open:
                             await openai_ws.close()
 
@@ -114,17 +181,19 @@ async def handle_media_stream(websocket: WebSocket):
                 print("Client disconnected.")
                 if openai_ws.open:
                     await openai_ws.close()
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 print("Received invalid JSON message.")
             except Exception as e:
                 print(f"Unexpected error in receive_from_twilio: {e}")
+            finally:
+                cancel_media_flush()
 
         async def send_to_twilio():
             """Receive events from the OpenAI Realtime API, send audio back to Twilio."""
             nonlocal stream_sid, ai_generating_response, user_speaking
             try:
                 async for openai_message in openai_ws:
-                    response = json.loads(openai_message)
+                    response = orjson.loads(openai_message)
                     response_type = response.get('type')
 
                     if response_type in LOG_EVENT_TYPES:
@@ -136,6 +205,7 @@ async def handle_media_stream(websocket: WebSocket):
                     elif response_type == 'input_audio_buffer.speech_started':
                         user_speaking = True
                         print("User started speaking")
+                        await flush_media()
                         if ai_generating_response:
                             print("Interruption detected in OpenAI stream. Sending response.cancel.")
                             await send_response_cancel(openai_ws)
@@ -150,7 +220,8 @@ async def handle_media_stream(websocket: WebSocket):
                             ai_generating_response = True
                             print("AI started generating response")
                         try:
-                            audio_payload = base64.b64encode(base64.b64decode(response['delta'])).decode('utf-8')
+                            # The delta is already base64, which is what Twilio expects
+                            audio_payload = response['delta']
                             audio_delta = {
                                 "event": "media",
                                 "streamSid": stream_sid,
@@ -158,7 +229,7 @@ async def handle_media_stream(websocket: WebSocket):
                                     "payload": audio_payload
                                 }
                             }
-                            await websocket.send_json(audio_delta)
+                            await websocket.send_text(orjson.dumps(audio_delta).decode())
                         except Exception as e:
                             print(f"Error processing audio data: {e}")
 
@@ -168,7 +239,7 @@ async def handle_media_stream(websocket: WebSocket):
 
                     # ... [handle other OpenAI events as before] ...
 
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 print("Received invalid JSON message from OpenAI.")
             except Exception as e:
                 print(f"Error in send_to_twilio: {e}")
@@ -177,33 +248,17 @@ async def handle_media_stream(websocket: WebSocket):
 
 async def send_session_update(openai_ws):
     """Send session update to OpenAI WebSocket."""
-    session_update = {
-        "type": "session.update",
-        "session": {
-            "turn_detection": {"type": "server_vad"},
-            "input_audio_format": "g711_ulaw",
-            "output_audio_format": "g711_ulaw",
-            "voice": VOICE,
-            "instructions": SYSTEM_MESSAGE,
-            "modalities": ["text", "audio"],
-            "temperature": 0.8,
-            "input_audio_transcription": {"model": "whisper-1"},
-
-        }
-    }
-    print('Sending session update:', json.dumps(session_update))
-    await openai_ws.send(json.dumps(session_update))
+    print('Sending session update:', SESSION_UPDATE_FRAME)
+    await openai_ws.send(SESSION_UPDATE_FRAME)
 
 
 async def send_response_cancel(openai_ws):
     """Send a response.cancel event to OpenAI to handle interruption."""
-    cancel_event = {
-        "event_id": f"event_{uuid.uuid4()}",
-        "type": "response.cancel"
-    }
-    print('Sending response.cancel event:', json.dumps(cancel_event))
-    await openai_ws.send(json.dumps(cancel_event))
+    cancel_event = RESPONSE_CANCEL_TEMPLATE % uuid.uuid4().hex
+    print('Sending response.cancel event:', cancel_event)
+    await openai_ws.send(cancel_event)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
\ No newline at end of file
+    # loop="auto" runs on uvloop when it is installed and falls back to asyncio otherwise
+    uvicorn.run(app, host="0.0.0.0", port=PORT, loop="auto")
\ No newline at end of file